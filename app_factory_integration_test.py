@@ -0,0 +1,56 @@
+"""
+Checks that building the app does not touch the database
+"""
+import os
+import tempfile
+import unittest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from lms import create_app, db, trainer_schedule
+
+class TestAppFactory(unittest.TestCase):
+    def setUp(self):
+        self.connections = []
+        event.listen(Engine, 'connect', self.on_connect)
+
+    def tearDown(self):
+        event.remove(Engine, 'connect', self.on_connect)
+
+    def on_connect(self, dbapi_connection, connection_record):
+        self.connections.append(dbapi_connection)
+
+    #test the factory reads its configuration and never connects
+    def test_create_app_does_not_connect(self):
+        app = create_app({'SQLALCHEMY_DATABASE_URI': "sqlite://", 'ATTACHMENT_DIR': '/tmp/lms-attachments'})
+
+        self.assertEqual(app.config['ATTACHMENT_DIR'], '/tmp/lms-attachments')
+        self.assertIn('/class/search', [rule.rule for rule in app.url_map.iter_rules()])
+        self.assertEqual(self.connections, [])
+
+    #test every app gets its own caches, indexes and grading settings
+    def test_apps_do_not_share_state(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = create_app({'SQLALCHEMY_DATABASE_URI': "sqlite://", 'CATALOG_CACHE_DB': os.path.join(directory, 'cache.db'),
+                                'GRADING_WORKERS': 3})
+            second = create_app({'SQLALCHEMY_DATABASE_URI': "sqlite://", 'CATALOG_CACHE_DB': None})
+
+            self.assertIsNotNone(first.extensions['lms'].catalog_cache.backend)
+            self.assertIsNone(second.extensions['lms'].catalog_cache.backend)
+            self.assertEqual(first.extensions['lms'].grading_worker.workers, 3)
+            with second.app_context():
+                self.assertIs(trainer_schedule._get_current_object(), second.extensions['lms'].trainer_schedule)
+                self.assertIsNot(trainer_schedule._get_current_object(), first.extensions['lms'].trainer_schedule)
+
+    #test the schema is created by the create-schema command
+    def test_create_schema_command(self):
+        app = create_app({'SQLALCHEMY_DATABASE_URI': "sqlite://", 'SQLALCHEMY_ENGINE_OPTIONS': {}})
+
+        result = app.test_cli_runner().invoke(args=['create-schema'])
+
+        self.assertEqual(result.exit_code, 0)
+        with app.app_context():
+            self.assertIn('courseclass', db.inspect(db.get_engine()).get_table_names())
+            db.drop_all()
+
+if __name__ == '__main__':
+    unittest.main()
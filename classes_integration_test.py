@@ -4,8 +4,14 @@ Owner of TDD: Weijie
 import unittest
 import flask_testing
 import json
-from datetime import datetime
-from lms import app, db, CourseClass, Course, User
+import os
+import tempfile
+import time
+from unittest import mock
+from datetime import date, datetime
+from sqlalchemy import event
+from lms import app, db, CourseClass, Course, User, Enrollment, CoursePrerequisite, migrate_enrollment, \
+    prerequisite_graph, trainer_schedule, expand_series, catalog_cache, SQLiteInvalidationBackend
 
 class TestApp(flask_testing.TestCase):
     app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite://"
@@ -18,11 +24,25 @@ class TestApp(flask_testing.TestCase):
 
     def setUp(self):
         db.create_all()
+        trainer_schedule.reset()
 
     def tearDown(self):
         db.session.remove()
         db.drop_all()
 
+    #counts the sql statements sent to the database while requesting url
+    def count_queries(self, url):
+        statements = []
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(response.status_code, 200)
+        return len(statements)
+
 
 class TestCourseClasses(TestApp):
     #test searching classes by courseId
@@ -832,5 +852,448 @@ class TestCourseClasses(TestApp):
             "approved": [[3, 1, 'abc'], [1, 2, 'bac'], [2, 3, 'cab']],
             "completed": [[2, 1, 'abc'], [3, 2, 'bac'], [1, 3, 'cab']]
         })
+
+    #test learner status changes are stored as enrollment rows
+    def test_enrollment_rows(self):
+        cc1 = CourseClass(courseClassId = 1, courseId = 1, learnerIds = "{'1': 0, '2': 1}")
+        db.session.add(cc1)
+        db.session.commit()
+
+        request_body = {
+            "courseClassId": 1,
+            "learnerId": '1'
+        }
+        response = self.client.post("/class/accept/learner",
+                                    data=json.dumps(request_body),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+        enrollments = Enrollment.query.order_by(Enrollment.position).all()
+        self.assertEqual([enrollment.json() for enrollment in enrollments], [
+            {"courseClassId": 1, "learnerId": '1', "status": 1},
+            {"courseClassId": 1, "learnerId": '2', "status": 1}
+        ])
+
+    #test deleting a learner and adding them back puts them at the end of the class
+    def test_readd_learner_keeps_order(self):
+        cc1 = CourseClass(courseClassId = 1, courseId = 1, learnerIds = "{'1': 0, '2': 1}")
+        db.session.add(cc1)
+        db.session.commit()
+
+        request_body = {
+            "courseClassId": 1,
+            "learnerId": '1'
+        }
+        self.client.post("/class/delete/learner",
+                        data=json.dumps(request_body),
+                        content_type='application/json')
+        response = self.client.post("/class/add/learner",
+                                    data=json.dumps(request_body),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(CourseClass.query.get(1).learnerIds, "{'2': 1, '1': 0}")
+
+    #test migrating legacy learnerIds strings into the enrollment table
+    def test_migrate_enrollment(self):
+        db.session.execute(db.text("ALTER TABLE courseclass ADD COLUMN learnerIds varchar(999)"))
+        db.session.execute(db.text("INSERT INTO courseclass (courseClassId, courseId, learnerIds) "
+                                   "VALUES (1, 1, \"{'1': 0, '2': 2}\"), (2, 1, '{}'), (3, 1, NULL)"))
+        db.session.commit()
+
+        self.assertEqual(migrate_enrollment(batch_size=2), 2)
+        self.assertEqual(migrate_enrollment(batch_size=2), 0)
+
+        response = self.client.get('/class/1')
+        self.assertEqual(response.json['data'][0]['learnerIds'], "{'1': 0, '2': 2}")
+
+    #test migrating a class that already has learners added by the new code keeps both
+    def test_migrate_enrollment_merges(self):
+        db.session.execute(db.text("ALTER TABLE courseclass ADD COLUMN learnerIds varchar(999)"))
+        db.session.execute(db.text("INSERT INTO courseclass (courseClassId, courseId, learnerIds) "
+                                   "VALUES (1, 1, \"{'1': 1, '2': 2}\")"))
+        db.session.commit()
+
+        request_body = {
+            "courseClassId": 1,
+            "learnerId": '3'
+        }
+        response = self.client.post("/class/add/learner",
+                                    data=json.dumps(request_body),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(migrate_enrollment(), 2)
+        self.assertEqual(migrate_enrollment(), 0)
+
+        enrollments = Enrollment.query.order_by(Enrollment.position).all()
+        self.assertEqual([enrollment.json() for enrollment in enrollments], [
+            {"courseClassId": 1, "learnerId": '3', "status": 0},
+            {"courseClassId": 1, "learnerId": '1', "status": 1},
+            {"courseClassId": 1, "learnerId": '2', "status": 2}
+        ])
+
+    #test find classes for a learner who is not in any class
+    def test_find_classes_learner_not_in_any(self):
+        c1 = Course(courseId = 1, courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c1)
+        cc1 = CourseClass(courseId = 1, learnerIds = "{'1': 0, '12': 1}")
+        db.session.add(cc1)
+        db.session.commit()
+
+        response = self.client.get('/class/find/2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            "pending": [],
+            "approved": [],
+            "completed": []
+        })
+
+    #test class listings by trainer and course use the same number of queries for any number of classes
+    def test_class_listing_query_count(self):
+        c1 = Course(courseId = 1, courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        c2 = Course(courseId = 2, courseName = 'bac', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        test_user1 = User(name = 'testuser1', subrole = 'testsubrole1',
+                    department = "testdepartment1", email = "testuser1@email.com")
+        db.session.add_all([c1, c2, test_user1])
+        db.session.add(CourseClass(courseId = 1, learnerIds = "{'1': 0}", trainerId = 1))
+        db.session.commit()
+        db.session.expunge_all()
+        trainer_queries = self.count_queries('/class/trainer/1')
+        course_queries = self.count_queries('/class/course/1')
+
+        for i in range(20):
+            db.session.add(CourseClass(courseId = 1 + i % 2, learnerIds = "{'1': 0}", trainerId = 1))
+        db.session.commit()
+        db.session.expunge_all()
+        self.assertEqual(self.count_queries('/class/trainer/1'), trainer_queries)
+        self.assertEqual(self.count_queries('/class/course/1'), course_queries)
+
+    #test learner names keep the roster order and are loaded with one query
+    def test_searching_learnerName_large_class(self):
+        c1 = Course(courseId = 1, courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c1)
+        for i in range(1, 31):
+            db.session.add(User(name = 'testuser' + str(i), subrole = 'testsubrole1',
+                    department = "testdepartment1", email = "testuser1@email.com"))
+        learnerIds = dict((str(i), i % 2) for i in range(30, 0, -1))
+        db.session.add(CourseClass(courseId = 1, learnerIds = learnerIds))
+        db.session.commit()
+        db.session.expunge_all()
+
+        self.assertEqual(self.count_queries('/class/learners/1'), 3)
+        response = self.client.get('/class/pending/1')
+        self.assertEqual(response.json, {
+            "data": [[str(i), 'testuser' + str(i)] for i in range(30, 0, -2)]
+        })
+
+    #test streaming all learners as ndjson
+    def test_find_all_learners_ndjson(self):
+        c1 = Course(courseId = 1, courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c1)
+        cc1 = CourseClass(courseId = 1, learnerIds = "{'2': 1, '1': 0}")
+        cc2 = CourseClass(courseId = 1, learnerIds = "{'1': 2}")
+        db.session.add(cc1)
+        db.session.add(cc2)
+        db.session.commit()
+
+        response = self.client.get('/class/all?format=ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual([json.loads(line) for line in response.data.decode().splitlines()], [
+            {"status": "approved", "learnerId": 2, "courseClassId": 1, "courseName": 'abc'},
+            {"status": "pending", "learnerId": 1, "courseClassId": 1, "courseName": 'abc'},
+            {"status": "completed", "learnerId": 1, "courseClassId": 2, "courseName": 'abc'}
+        ])
+
+class TestTrainerSchedule(TestApp):
+    def setUp(self):
+        super().setUp()
+        db.session.add(Course(courseName = 'abc', courseDesc = '123', prerequisites = "", isActive = 1))
+        db.session.add(CourseClass(courseId = 1, startDateTime = datetime(2021, 10, 8), endDateTime = datetime(2021, 10, 20),
+                                   learnerIds = "{}", trainerId = 1, classSize = 10))
+        db.session.add(CourseClass(courseId = 1, startDateTime = datetime(2021, 11, 1), endDateTime = datetime(2021, 11, 5),
+                                   learnerIds = "{}", trainerId = 1, classSize = 10))
+        db.session.add(CourseClass(courseId = 1, startDateTime = datetime(2021, 10, 15), endDateTime = datetime(2021, 10, 16),
+                                   learnerIds = "{}", trainerId = 2, classSize = 10))
+        db.session.commit()
+
+    def create(self, start, end, trainerId):
+        return self.client.post("/class/add",
+                                data=json.dumps({"courseId": 1, "startDateTime": start, "endDateTime": end,
+                                                 "learnerIds": "{}", "trainerId": trainerId, "classSize": 10}),
+                                content_type='application/json')
+
+    #test creating a class that overlaps another class of the trainer is rejected
+    def test_create_class_conflict(self):
+        response = self.create('19/10/2021', '22/10/2021', 1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json, {
+            "message": "Trainer has another class at the same time.",
+            "data": {"conflictingClassIds": [1]}
+        })
+        self.assertEqual(self.create('21/10/2021', '31/10/2021', 1).status_code, 201)
+        self.assertEqual(self.create('30/10/2021', '02/11/2021', 1).json['data']['conflictingClassIds'], [4, 2])
+
+    #test assigning a trainer checks the class dates against the trainer's classes
+    def test_add_trainer_conflict(self):
+        response = self.client.post("/class/add/trainer", data=json.dumps({"courseClassId": 3, "trainerId": 1}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+
+        self.client.post("/class/delete/1")
+        response = self.client.post("/class/add/trainer", data=json.dumps({"courseClassId": 3, "trainerId": 1}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post("/class/add/trainer", data=json.dumps({"courseClassId": 3, "trainerId": 1}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+    #test a trainerId sent as a string is checked and stored as the int
+    def test_string_trainerId(self):
+        self.assertEqual(self.create('19/10/2021', '22/10/2021', "1").status_code, 409)
+        response = self.create('21/10/2021', '31/10/2021', "1")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['data']['trainerId'], 1)
+        self.assertEqual(self.create('30/10/2021', '30/10/2021', 1).json['data']['conflictingClassIds'], [4])
+
+        response = self.client.post("/class/add/trainer", data=json.dumps({"courseClassId": 3, "trainerId": "1"}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+
+    #test a trainerId that is not a number is rejected
+    def test_invalid_trainerId(self):
+        response = self.create('21/10/2021', '31/10/2021', "abc")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"message": "trainerId must be a number."})
+        response = self.client.post("/class/add/trainer", data=json.dumps({"courseClassId": 3, "trainerId": 1.5}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CourseClass.query.get(3).trainerId, 2)
+
+    #test roster changes keep the schedule loaded and only trainer or date changes reach other workers
+    def test_roster_change_keeps_schedule(self):
+        with tempfile.TemporaryDirectory() as directory:
+            catalog_cache.backend = SQLiteInvalidationBackend(os.path.join(directory, 'cache.db'))
+            other = SQLiteInvalidationBackend(os.path.join(directory, 'cache.db'))
+            try:
+                self.count_queries("/trainer/1/availability?from=18/10/2021&to=02/11/2021")
+                self.client.post("/class/add/learner", data=json.dumps({"courseClassId": 1, "learnerId": 5}),
+                                 content_type='application/json')
+                self.assertEqual(other.poll(), [])
+                self.assertEqual(self.count_queries("/trainer/1/availability?from=18/10/2021&to=02/11/2021"), 0)
+
+                self.client.post("/class/add/trainer", data=json.dumps({"courseClassId": 3, "trainerId": 3}),
+                                 content_type='application/json')
+                self.assertEqual(other.poll(), ['schedules'])
+                self.assertEqual(self.count_queries("/trainer/3/availability?from=15/10/2021&to=15/10/2021"), 0)
+            finally:
+                catalog_cache.backend = None
+
+    #test without a cache backend a class written by another worker is seen once the schedule is older than the ttl
+    def test_schedule_reloads_after_ttl(self):
+        url = "/trainer/1/availability?from=21/10/2021&to=31/10/2021"
+        self.assertEqual(self.client.get(url).json['data']['free'], True)
+        table = CourseClass.__table__
+        db.session.execute(table.insert().values(courseId = 1, startDateTime = datetime(2021, 10, 25),
+                                                 endDateTime = datetime(2021, 10, 26), trainerId = 1, classSize = 10))
+        db.session.commit()
+        self.assertEqual(self.client.get(url).json['data']['free'], True)
+
+        with mock.patch('lms.time.monotonic', return_value = time.monotonic() + catalog_cache.ttl + 1):
+            self.assertEqual(self.client.get(url).json['data']['free'], False)
+
+    #test free/busy queries of a trainer
+    def test_trainer_availability(self):
+        response = self.client.get("/trainer/1/availability?from=18/10/2021&to=02/11/2021")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data']['free'], False)
+        self.assertEqual([busy['courseClassId'] for busy in response.json['data']['busy']], [1, 2])
+
+        response = self.client.get("/trainer/1/availability?from=21/10/2021&to=31/10/2021")
+        self.assertEqual(response.json['data']['free'], True)
+        self.assertEqual(self.client.get("/trainer/1/availability?from=21/10/2021").status_code, 400)
+
+
+class TestClassSearch(TestApp):
+    def setUp(self):
+        super().setUp()
+        db.session.add(Course(courseName = 'abc', courseDesc = '123', prerequisites = "", isActive = 1))
+        db.session.add(Course(courseName = 'xyz', courseDesc = '123', prerequisites = "", isActive = 1))
+        db.session.add(User(name = 'trainer1', subrole = 'Trainer', department = 'Engineer',
+                            email = "trainer1@email.com"))
+        for courseId, day, trainerId in [(1, 5, 1), (2, 10, 1), (1, 10, None), (2, 20, 1), (1, 28, None)]:
+            db.session.add(CourseClass(courseId = courseId, startDateTime = datetime(2021, 10, day),
+                                       endDateTime = datetime(2021, 10, day + 2), learnerIds = "{}",
+                                       trainerId = trainerId, classSize = 10))
+        db.session.commit()
+
+    #test searching classes by date range with the course and trainer names
+    def test_search_classes(self):
+        response = self.client.get("/class/search?from=07/10/2021&to=20/10/2021")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['courseClassId'] for c in response.json['data']['classes']], [1, 2, 3, 4])
+        self.assertEqual(response.json['data']['classes'][1], {
+            "courseClassId": 2,
+            "courseId": 2,
+            "startDateTime": 'Sun, 10 Oct 2021 00:00:00 GMT',
+            "endDateTime": 'Tue, 12 Oct 2021 00:00:00 GMT',
+            "trainerId": 1,
+            "classSize": 10,
+            "courseName": 'xyz',
+            "trainerName": 'trainer1'
+        })
+        self.assertEqual(response.json['data']['next_cursor'], None)
+
+    #test the course and trainer filters
+    def test_search_classes_filters(self):
+        response = self.client.get("/class/search?courseId=1")
+        self.assertEqual([c['courseClassId'] for c in response.json['data']['classes']], [1, 3, 5])
+        response = self.client.get("/class/search?trainerId=1&from=11/10/2021")
+        self.assertEqual([c['courseClassId'] for c in response.json['data']['classes']], [2, 4])
+        self.assertEqual(self.client.get("/class/search?courseId=3").status_code, 404)
+
+    #test walking the search results page by page
+    def test_search_classes_pages(self):
+        seen = []
+        url = "/class/search?limit=2"
+        while url:
+            data = self.client.get(url).json['data']
+            seen.extend(c['courseClassId'] for c in data['classes'])
+            url = "/class/search?limit=2&after=" + data['next_cursor'] if data['next_cursor'] else None
+        self.assertEqual(seen, [1, 2, 3, 4, 5])
+        self.assertEqual(self.client.get("/class/search?after=abc").status_code, 400)
+
+
+class TestClassSeries(TestApp):
+    def setUp(self):
+        super().setUp()
+        db.session.add(Course(courseName = 'abc', courseDesc = '123', prerequisites = "", isActive = 1))
+        db.session.add(CourseClass(courseId = 1, startDateTime = datetime(2022, 3, 30), endDateTime = datetime(2022, 4, 2),
+                                   learnerIds = "{}", trainerId = 2, classSize = 10))
+        db.session.commit()
+
+    def create(self, body):
+        series = {"courseId": 1, "startDateTime": '31/01/2022', "endDateTime": '01/02/2022', "trainerId": 1, "classSize": 20}
+        series.update(body)
+        return self.client.post("/class/series", data=json.dumps(series), content_type='application/json')
+
+    #test monthly occurrences keep the day of the month where they can
+    def test_expand_monthly_series(self):
+        occurrences = expand_series(date(2022, 1, 31), date(2022, 2, 1), 'monthly', count = 4)
+        self.assertEqual([start for start, end in occurrences],
+                         [date(2022, 1, 31), date(2022, 2, 28), date(2022, 3, 31), date(2022, 4, 30)])
+        self.assertEqual(len(expand_series(date(2022, 1, 3), date(2022, 1, 3), 'weekly', interval = 2,
+                                           until = date(2022, 3, 1))), 5)
+
+    #test creating a series inserts every class and indexes them for the trainer
+    def test_create_class_series(self):
+        response = self.create({"frequency": 'monthly', "count": 3})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([(c['courseClassId'], c['startDateTime']) for c in response.json['data']['classes']], [
+            (2, 'Mon, 31 Jan 2022 00:00:00 GMT'),
+            (3, 'Mon, 28 Feb 2022 00:00:00 GMT'),
+            (4, 'Thu, 31 Mar 2022 00:00:00 GMT')
+        ])
+        self.assertEqual(CourseClass.query.filter_by(trainerId = 1).count(), 3)
+        response = self.client.get("/trainer/1/availability?from=02/03/2022&to=31/03/2022")
+        self.assertEqual([busy['courseClassId'] for busy in response.json['data']['busy']], [4])
+
+    #test a series overlapping the trainer's classes is rejected as a whole
+    def test_create_class_series_conflict(self):
+        response = self.create({"frequency": 'monthly', "count": 3, "trainerId": 2})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json['data']['conflictingClassIds'], [1])
+        self.assertEqual(CourseClass.query.count(), 1)
+
+        response = self.create({"frequency": 'weekly', "count": 2, "endDateTime": '08/02/2022'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"message": "Classes of the series overlap each other."})
+
+    #test an invalid rule is rejected
+    def test_create_class_series_invalid(self):
+        self.assertEqual(self.create({"frequency": 'daily', "count": 3}).json, {"message": "frequency must be weekly or monthly."})
+        self.assertEqual(self.create({"frequency": 'weekly'}).json, {"message": "Either count or until is required."})
+        self.assertEqual(self.create({"frequency": 'weekly', "until": '31/01/2030'}).status_code, 400)
+
+
+class TestEligibility(TestApp):
+    def setUp(self):
+        super().setUp()
+        prerequisite_graph.reset()
+        for name in ['a', 'b', 'c']:
+            db.session.add(Course(courseName = name, courseDesc = '123', prerequisites = "", isActive = 1))
+        db.session.add_all([CoursePrerequisite(courseId = 3, prerequisiteId = 2),
+                            CoursePrerequisite(courseId = 2, prerequisiteId = 1)])
+        #learner 1 completed a and b, learner 2 only a, learner 3 is still taking b
+        db.session.add(CourseClass(courseId = 1, startDateTime = datetime(2021, 10, 8), endDateTime = datetime(2021, 10, 9),
+                                   learnerIds = "{'1': 2, '2': 2}", trainerId = 1, classSize = 10))
+        db.session.add(CourseClass(courseId = 2, startDateTime = datetime(2021, 11, 8), endDateTime = datetime(2021, 11, 9),
+                                   learnerIds = "{'1': 2, '3': 1}", trainerId = 1, classSize = 10))
+        db.session.commit()
+
+    def check(self, body):
+        return self.client.post("/class/eligibility", data=json.dumps(body), content_type='application/json')
+
+    #test eligibility of a batch against the transitive prerequisites
+    def test_eligibility(self):
+        response = self.check({"courseId": 3, "learnerIds": [1, 2, 3, 4, 1]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            "data": {
+                "courseId": 3,
+                "prerequisiteIds": [1, 2],
+                "eligible": [1],
+                "ineligible": [
+                    {"learnerId": 2, "missingPrerequisites": [{"courseId": 2, "courseName": 'b'}]},
+                    {"learnerId": 3, "missingPrerequisites": [{"courseId": 1, "courseName": 'a'},
+                                                              {"courseId": 2, "courseName": 'b'}]},
+                    {"learnerId": 4, "missingPrerequisites": [{"courseId": 1, "courseName": 'a'},
+                                                              {"courseId": 2, "courseName": 'b'}]}
+                ]
+            }
+        })
+
+    #test a learner sent as a number and as a string is checked once
+    def test_eligibility_duplicate_ids(self):
+        response = self.check({"courseId": 3, "learnerIds": [1, "1", "2"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data']['eligible'], [1])
+        self.assertEqual([learner['learnerId'] for learner in response.json['data']['ineligible']], [2])
+
+    #test a courseId sent as a string is checked against the same prerequisites
+    def test_eligibility_string_courseId(self):
+        response = self.check({"courseId": "3", "learnerIds": [1, 2]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data']['courseId'], 3)
+        self.assertEqual(response.json['data']['prerequisiteIds'], [1, 2])
+        self.assertEqual(response.json['data']['eligible'], [1])
+
+    #test ids that are not numbers are rejected
+    def test_eligibility_invalid_ids(self):
+        response = self.check({"courseId": 3, "learnerIds": [1, {}, "abc"]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"message": "learnerIds must be numbers, {}, \"abc\" are not."})
+
+    #test every learner is eligible for a course without prerequisites
+    def test_eligibility_no_prerequisites(self):
+        response = self.check({"courseId": 1, "learnerIds": [5, 6]})
+        self.assertEqual(response.json['data']['eligible'], [5, 6])
+        self.assertEqual(response.json['data']['ineligible'], [])
+
+    #test eligibility for a course that does not exist
+    def test_eligibility_no_course(self):
+        response = self.check({"courseId": 9, "learnerIds": [1]})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json, {"message": "Course was not found."})
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -5,7 +5,12 @@ Owner of TDD: Weijie
 import unittest
 import flask_testing
 import json
-from lms import app, db, Course
+import os
+import tempfile
+import time
+from unittest import mock
+from lms import app, db, Course, catalog_cache, CatalogCache, SQLiteInvalidationBackend, course_name_index, \
+    prerequisite_graph, CoursePrerequisite
 
 class TestApp(flask_testing.TestCase):
     app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite://"
@@ -17,6 +22,9 @@ class TestApp(flask_testing.TestCase):
 
     def setUp(self):
         db.create_all()
+        catalog_cache.clear()
+        course_name_index.reset()
+        prerequisite_graph.reset()
 
     def tearDown(self):
         db.session.remove()
@@ -220,5 +228,264 @@ class TestCourses(TestApp):
         })
 
 
+    #test course lookups are served from the cache after the first request
+    def test_course_cache_hit(self):
+        c1 = Course(courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c1)
+        db.session.commit()
+
+        self.client.get('/course/id/1')
+        self.client.get('/course/id/1')
+        response = self.client.get('/cache/stats')
+        self.assertEqual(response.json['data']['hits'], 1)
+        self.assertEqual(response.json['data']['misses'], 1)
+
+    #test updating a course invalidates the cached course and course list
+    def test_course_cache_invalidated_on_update(self):
+        c1 = Course(courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c1)
+        db.session.commit()
+        self.client.get('/courses')
+        self.client.get('/course/id/1')
+        self.client.get('/course/abc')
+
+        request_body = {
+            "courseId": 1,
+            "courseName": 'cab',
+            "courseDesc": '321',
+            "prerequisites": "fed",
+            "isActive": 0
+        }
+        self.client.post("/course/update",
+                        data=json.dumps(request_body),
+                        content_type='application/json')
+
+        self.assertEqual(self.client.get('/courses').json['data']['courses'][0]['courseName'], 'cab')
+        self.assertEqual(self.client.get('/course/id/1').json['data']['courseName'], 'cab')
+        self.assertEqual(self.client.get('/course/abc').status_code, 404)
+
+    #test the cache evicts the least recently used entry and expires entries after the ttl
+    def test_cache_lru_and_ttl(self):
+        cache = CatalogCache(max_size=2, ttl=0.05)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), 1)
+        time.sleep(0.1)
+        self.assertEqual(cache.get('a'), None)
+
+    #test invalidations are shared between caches through the sqlite backend
+    def test_cache_sqlite_invalidation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.db')
+            cache1 = CatalogCache(backend=SQLiteInvalidationBackend(path))
+            cache2 = CatalogCache(backend=SQLiteInvalidationBackend(path))
+            cache1.set('courses', [1])
+            cache2.set('courses', [1])
+            invalidated = []
+            cache1.listeners.append(invalidated.append)
+            cache2.listeners.append(invalidated.append)
+            cache1.invalidate('courses')
+            self.assertEqual(cache2.get('courses'), None)
+            #the worker that invalidated already dropped its own state, only the others are told
+            cache1.poll()
+            self.assertEqual(invalidated, ['courses'])
+
+
+    #test polling the course list with If-None-Match
+    def test_courses_etag(self):
+        c1 = Course(courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c1)
+        db.session.commit()
+
+        response = self.client.get('/courses')
+        etag = response.headers['ETag']
+        response = self.client.get('/courses', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        request_body = {
+            "courseName": 'def',
+            "courseDesc": '456',
+            "prerequisites": "ghi",
+            "isActive": 1
+        }
+        self.client.post("/course/add",
+                        data=json.dumps(request_body),
+                        content_type='application/json')
+        response = self.client.get('/courses', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(len(response.json['data']['courses']), 2)
+
+
+    #test a cached course list is not served under the ETag of a newer version, e.g. after another worker's write
+    def test_courses_etag_stale_cache(self):
+        c1 = Course(courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c1)
+        db.session.commit()
+        etag = self.client.get('/courses').headers['ETag']
+
+        #written without invalidating the cache, as another worker would
+        c1.courseName = 'cab'
+        db.session.commit()
+
+        response = self.client.get('/courses', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data']['courses'][0]['courseName'], 'cab')
+        response = self.client.get('/courses', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    #test paging through active courses with a cursor
+    def test_search_courses_paginated(self):
+        for i in range(1, 6):
+            db.session.add(Course(courseName = 'course' + str(i), courseDesc = '123',
+                    prerequisites = "def", isActive = i % 2))
+        db.session.commit()
+
+        response = self.client.get('/courses?isActive=1&limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([course['courseId'] for course in response.json['data']['courses']], [1, 3])
+        self.assertEqual(response.json['data']['next_cursor'], 3)
+
+        response = self.client.get('/courses?isActive=1&limit=2&after=3')
+        self.assertEqual([course['courseId'] for course in response.json['data']['courses']], [5])
+        self.assertEqual(response.json['data']['next_cursor'], None)
+
+
+    #test course name autocomplete returns the first matches in name order
+    def test_search_course_by_prefix(self):
+        for courseName in ('Python Basics', 'python advanced', 'Java', 'Pyramids'):
+            db.session.add(Course(courseName = courseName, courseDesc = '123',
+                    prerequisites = "def", isActive = 1))
+        db.session.commit()
+
+        response = self.client.get("/course/search?prefix=pyt&limit=5")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            "data": [
+                {"courseId": 2, "courseName": 'python advanced'},
+                {"courseId": 1, "courseName": 'Python Basics'}
+            ]
+        })
+        self.assertEqual(len(self.client.get("/course/search?prefix=py&limit=2").json['data']), 2)
+        self.assertEqual(self.client.get("/course/search?prefix=c").status_code, 404)
+
+    #test the name index follows renames and deletes
+    def test_course_name_index_updates(self):
+        c1 = Course(courseName = 'abc', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c1)
+        db.session.commit()
+        self.assertTrue(course_name_index.exists('abc'))
+
+        c1.courseName = 'abd'
+        db.session.commit()
+        self.assertFalse(course_name_index.exists('abc'))
+        self.assertEqual(course_name_index.search('ab'), [{"courseId": 1, "courseName": 'abd'}])
+
+        c2 = Course(courseName = 'xyz', courseDesc = '123',
+                    prerequisites = "def", isActive = 1)
+        db.session.add(c2)
+        db.session.flush()
+        db.session.rollback()
+        self.assertFalse(course_name_index.exists('xyz'))
+
+        self.client.post("/course/delete/1")
+        self.assertFalse(course_name_index.exists('abd'))
+
+
+class TestPrerequisites(TestApp):
+    def setUp(self):
+        super().setUp()
+        for name in ['a', 'b', 'c', 'd']:
+            db.session.add(Course(courseName = name, courseDesc = '123', prerequisites = "", isActive = 1))
+        db.session.commit()
+
+    def update(self, courseId, prerequisiteIds):
+        return self.client.post("/course/update",
+                                data=json.dumps({"courseId": courseId, "courseName": "abcd"[courseId - 1],
+                                                 "courseDesc": '123', "prerequisites": "", "isActive": 1,
+                                                 "prerequisiteIds": prerequisiteIds}),
+                                content_type='application/json')
+
+    #test direct and transitive prerequisites
+    def test_course_prerequisites(self):
+        self.assertEqual(self.update(2, [1]).status_code, 201)
+        self.assertEqual(self.update(3, [2]).status_code, 201)
+        response = self.client.post("/course/add",
+                                    data=json.dumps({"courseName": 'e', "courseDesc": '123', "prerequisites": "",
+                                                     "isActive": 1, "prerequisiteIds": [3, 4]}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get("/course/5/prerequisites")
+        self.assertEqual([course['courseId'] for course in response.json['data']['prerequisites']], [3, 4])
+        response = self.client.get("/course/5/prerequisites?transitive=1")
+        self.assertEqual(response.json['data'], {
+            "courseId": 5,
+            "transitive": True,
+            "prerequisites": [
+                {"courseId": 1, "courseName": 'a'},
+                {"courseId": 2, "courseName": 'b'},
+                {"courseId": 3, "courseName": 'c'},
+                {"courseId": 4, "courseName": 'd'}
+            ]
+        })
+
+    #test an update that would create a cycle is rejected
+    def test_prerequisite_cycle(self):
+        self.update(2, [1])
+        self.update(3, [2])
+
+        response = self.update(1, [3])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"message": "Prerequisites would create a cycle."})
+        self.assertEqual(self.update(1, [1]).status_code, 400)
+        self.assertEqual(self.client.get("/course/1/prerequisites").json['data']['prerequisites'], [])
+
+    #test a string courseId is checked for cycles like an int one
+    def test_prerequisite_string_courseId(self):
+        self.update(2, [1])
+        response = self.client.post("/course/update",
+                                    data=json.dumps({"courseId": "1", "courseName": 'a', "courseDesc": '123',
+                                                     "prerequisites": "", "isActive": 1, "prerequisiteIds": [2]}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"message": "Prerequisites would create a cycle."})
+
+    #test without a cache backend prerequisites written by another worker are seen once the graph is older than the ttl
+    def test_prerequisites_reload_after_ttl(self):
+        self.assertEqual(self.client.get("/course/2/prerequisites").json['data']['prerequisites'], [])
+        db.session.execute(CoursePrerequisite.__table__.insert().values(courseId = 2, prerequisiteId = 1))
+        db.session.commit()
+        self.assertEqual(self.client.get("/course/2/prerequisites").json['data']['prerequisites'], [])
+
+        with mock.patch('lms.time.monotonic', return_value = time.monotonic() + catalog_cache.ttl + 1):
+            response = self.client.get("/course/2/prerequisites")
+        self.assertEqual([course['courseId'] for course in response.json['data']['prerequisites']], [1])
+
+    #test prerequisites must be existing courses
+    def test_prerequisite_missing_course(self):
+        response = self.update(1, [9])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"message": "Prerequisite courses 9 do not exist."})
+
+    #test deleting a course removes it from the prerequisites of other courses
+    def test_delete_prerequisite_course(self):
+        self.update(3, [1, 2])
+        self.client.post("/course/delete/1")
+
+        response = self.client.get("/course/3/prerequisites?transitive=1")
+        self.assertEqual([course['courseId'] for course in response.json['data']['prerequisites']], [2])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
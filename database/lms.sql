@@ -11,7 +11,19 @@ create table user
     subrole varchar(100) NOT NULL,
     department varchar(100) NOT NULL,
     email varchar(100) NOT NULL,
-    PRIMARY KEY (userId)
+    PRIMARY KEY (userId),
+    INDEX ix_user_department (department, userId),
+    INDEX ix_user_subrole (subrole, userId),
+    UNIQUE INDEX ux_user_name (name)
+);
+
+create table usernamegram
+(
+    gram varchar(3) NOT NULL,
+    userId int NOT NULL,
+    PRIMARY KEY (gram, userId),
+    INDEX ix_usernamegram_userId (userId),
+    FOREIGN KEY fk1 (userId) REFERENCES user(userId) ON DELETE CASCADE
 );
 
 create table course
@@ -21,7 +33,19 @@ create table course
     courseDesc varchar(999) NOT NULL,
     prerequisites varchar(999) NOT NULL,
     isActive boolean NOT NULL,
-    PRIMARY KEY (courseid)
+    PRIMARY KEY (courseid),
+    INDEX ix_course_isActive (isActive, courseId),
+    UNIQUE INDEX ux_course_courseName (courseName)
+);
+
+create table courseprerequisite
+(
+    courseId int NOT NULL,
+    prerequisiteId int NOT NULL,
+    PRIMARY KEY (courseId, prerequisiteId),
+    INDEX ix_courseprerequisite_prerequisiteId (prerequisiteId),
+    FOREIGN KEY fk1 (courseId) REFERENCES course(courseId) ON DELETE CASCADE,
+    FOREIGN KEY fk2 (prerequisiteId) REFERENCES course(courseId) ON DELETE CASCADE
 );
 
 create table courseclass
@@ -30,24 +54,53 @@ create table courseclass
     courseId int NOT NULL,
     startDateTime datetime,
     endDateTime datetime,
-    learnerIds varchar(999) NULL,
     trainerId int NULL,
     classSize int NULL,
+    nextLessonOrdinal int NOT NULL DEFAULT 0,
     PRIMARY KEY (courseClassId),
+    INDEX ix_courseclass_trainerId (trainerId, startDateTime),
+    INDEX ix_courseclass_courseId (courseId, startDateTime),
+    INDEX ix_courseclass_startDateTime (startDateTime, courseClassId),
     FOREIGN KEY fk1 (courseId) REFERENCES course(courseId)
 );
 
+create table enrollment
+(
+    courseClassId int NOT NULL,
+    learnerId varchar(100) NOT NULL,
+    status int NOT NULL,
+    position int NOT NULL,
+    PRIMARY KEY (courseClassId, learnerId),
+    INDEX ix_enrollment_learnerId (learnerId),
+    FOREIGN KEY fk1 (courseClassId) REFERENCES courseclass(courseClassId)
+);
+
+create table tableversion
+(
+    tableName varchar(100) NOT NULL,
+    version int NOT NULL,
+    PRIMARY KEY (tableName)
+);
+
+insert into tableversion (tableName, version) values
+    ('course', 0),
+    ('courseclass', 0),
+    ('enrollment', 0),
+    ('lesson', 0),
+    ('lessoncontent', 0),
+    ('lessonlink', 0),
+    ('user', 0);
+
 create table courseprogress
 (
-	learnerId int NULL,
     courseClassId int NOT NULL,
+	learnerId varchar(100) NOT NULL,
     courseId int NOT NULL,
     isComplete boolean NULL,
     completedDateTime datetime NULL,
     currentLessonId int NULL,
-    completedLessonIDs varchar(999) NULL,
-    incompleteLessonIDs varchar(999) NULL,
-    FOREIGN KEY fk1 (learnerId) REFERENCES user(userId),
+    completedLessons blob NOT NULL,
+    PRIMARY KEY (courseClassId, learnerId),
     FOREIGN KEY fk2 (courseClassId) REFERENCES courseclass(courseClassId),
     FOREIGN KEY fk3 (courseId) REFERENCES course(courseId)
 );
@@ -57,12 +110,45 @@ create table lesson
 	lessonId int NOT NULL AUTO_INCREMENT,
     courseClassId int NOT NULL,
 	lessonName varchar(200),
-    lessonContent varchar(999),
-    links varchar(999),
+    position int NOT NULL DEFAULT 0,
+    ordinal int NOT NULL DEFAULT 0,
     PRIMARY KEY (lessonId),
+    INDEX ix_lesson_courseClassId (courseClassId, position),
     FOREIGN KEY fk1 (courseClassId) REFERENCES courseclass(courseClassId)
 );
 
+create table lessoncontent
+(
+    lessonId int NOT NULL,
+    position int NOT NULL,
+    content mediumtext NOT NULL,
+    PRIMARY KEY (lessonId, position),
+    FOREIGN KEY fk1 (lessonId) REFERENCES lesson(lessonId) ON DELETE CASCADE
+);
+
+create table lessonlink
+(
+    lessonId int NOT NULL,
+    position int NOT NULL,
+    link text NOT NULL,
+    PRIMARY KEY (lessonId, position),
+    FOREIGN KEY fk1 (lessonId) REFERENCES lesson(lessonId) ON DELETE CASCADE
+);
+
+create table lessonattachment
+(
+    attachmentId int NOT NULL AUTO_INCREMENT,
+    lessonId int NOT NULL,
+    fileName varchar(250) NOT NULL,
+    mimeType varchar(100) NOT NULL,
+    size bigint NOT NULL,
+    sha256 char(64) NOT NULL,
+    PRIMARY KEY (attachmentId),
+    KEY ix_lessonattachment_lessonId (lessonId),
+    KEY ix_lessonattachment_sha256 (sha256),
+    FOREIGN KEY fk1 (lessonId) REFERENCES lesson(lessonId) ON DELETE CASCADE
+);
+
 create table quiz
 (
 	quizId int NOT NULL AUTO_INCREMENT,
@@ -71,6 +157,7 @@ create table quiz
     passingMark int NULL,
     numOfQns int NULL,
     PRIMARY KEY (quizId),
+    INDEX ix_quiz_lessonId (lessonId),
     FOREIGN KEY fk1 (lessonId) REFERENCES lesson(lessonId)
 );
 
@@ -84,6 +171,7 @@ create table question
     questionOptions varchar(999) NULL,
     answer char(1) NULL,
     PRIMARY KEY (questionId),
+    INDEX ix_question_quizId (quizId),
     FOREIGN KEY fk1 (quizId) REFERENCES quiz(quizId)
 );
 
@@ -99,6 +187,7 @@ create table quizoutcome
     passed boolean,
     attemptedNumber int,  
     PRIMARY KEY (quizOutcomeId),
+    UNIQUE INDEX ux_quizoutcome_attempt (quizId, userId, attemptedNumber),
     FOREIGN KEY fk1 (quizId) REFERENCES quiz(quizId),
     FOREIGN KEY fk2 (lessonId) REFERENCES quiz(lessonId),
     FOREIGN KEY fk5 (userId) REFERENCES user(userId)
@@ -115,8 +204,47 @@ create table questionoutcome
     quizOutcomeId int,
     selectedOption char(1),
     isCorrect boolean,    
+    PRIMARY KEY (quizOutcomeId, questionId),
     FOREIGN KEY fk1 (quizId) REFERENCES quiz(quizId),
     FOREIGN KEY fk2 (lessonId) REFERENCES quiz(lessonId),
     FOREIGN KEY fk5 (questionId) REFERENCES question(questionId),
     FOREIGN KEY fk7 (userId) REFERENCES user(userId)
 );
+
+create table questionstats
+(
+    questionId int NOT NULL,
+    quizId int NOT NULL,
+    attempts bigint NOT NULL DEFAULT 0,
+    correct bigint NOT NULL DEFAULT 0,
+    sumMarks bigint NOT NULL DEFAULT 0,
+    sumMarksSq bigint NOT NULL DEFAULT 0,
+    sumCorrectMarks bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (questionId),
+    INDEX ix_questionstats_quizId (quizId)
+);
+
+create table questionoptionstats
+(
+    questionId int NOT NULL,
+    selectedOption char(1) NOT NULL,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (questionId, selectedOption)
+);
+
+create table quizattempt
+(
+    attemptId int NOT NULL AUTO_INCREMENT,
+    quizId int NOT NULL,
+    userId int NOT NULL,
+    courseClassId int NULL,
+    answers text NOT NULL,
+    status int NOT NULL DEFAULT 0,
+    claimToken varchar(32) NULL,
+    claimedAt datetime NULL,
+    quizOutcomeId int NULL,
+    submittedAt datetime NOT NULL,
+    retries int NOT NULL DEFAULT 0,
+    PRIMARY KEY (attemptId),
+    INDEX ix_quizattempt_status (status, attemptId)
+);
@@ -0,0 +1,22 @@
+-- Moves courseclass.learnerIds into its own table.
+-- 1. run this file
+-- 2. stop the instances running the old code, they keep writing courseclass.learnerIds
+--    and those writes are not copied once their class has been migrated
+-- 3. run `flask migrate-enrollment` to copy the existing learnerIds. It must finish before the
+--    new code serves writes. It merges into the enrollment rows a class already has, so it can
+--    be re-run after an interruption without losing learners
+-- 4. once every instance runs the new code, courseclass.learnerIds can be dropped
+USE lms;
+
+create table if not exists enrollment
+(
+    courseClassId int NOT NULL,
+    learnerId varchar(100) NOT NULL,
+    status int NOT NULL,
+    position int NOT NULL,
+    PRIMARY KEY (courseClassId, learnerId),
+    INDEX ix_enrollment_learnerId (learnerId),
+    FOREIGN KEY fk1 (courseClassId) REFERENCES courseclass(courseClassId)
+);
+
+alter table courseclass modify learnerIds varchar(999) NULL;
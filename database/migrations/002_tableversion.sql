@@ -0,0 +1,20 @@
+-- Per-table change counters used for ETags on the polled list endpoints.
+-- Only the tables behind an ETag (the @conditional decorators in lms.py) are versioned,
+-- their rows are seeded here so writes only ever update them.
+USE lms;
+
+create table if not exists tableversion
+(
+    tableName varchar(100) NOT NULL,
+    version int NOT NULL,
+    PRIMARY KEY (tableName)
+);
+
+insert ignore into tableversion (tableName, version) values
+    ('course', 0),
+    ('courseclass', 0),
+    ('enrollment', 0),
+    ('lesson', 0),
+    ('lessoncontent', 0),
+    ('lessonlink', 0),
+    ('user', 0);
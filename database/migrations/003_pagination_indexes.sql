@@ -0,0 +1,6 @@
+-- Indexes serving the filters on the paginated /courses and /user endpoints.
+USE lms;
+
+create index ix_course_isActive on course (isActive, courseId);
+create index ix_user_department on user (department, userId);
+create index ix_user_subrole on user (subrole, userId);
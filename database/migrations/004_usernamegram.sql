@@ -0,0 +1,12 @@
+-- Trigram index over user names for /user/search and /user/engineer/name/<name>.
+-- After running this file, fill it with `flask rebuild-name-index`.
+USE lms;
+
+create table if not exists usernamegram
+(
+    gram varchar(3) NOT NULL,
+    userId int NOT NULL,
+    PRIMARY KEY (gram, userId),
+    INDEX ix_usernamegram_userId (userId),
+    FOREIGN KEY fk1 (userId) REFERENCES user(userId) ON DELETE CASCADE
+);
@@ -0,0 +1,12 @@
+-- Secondary indexes for every column the handlers filter on.
+-- The unique indexes back the duplicate name checks in create_course and create_user,
+-- remove any existing duplicate names before running this file.
+-- Verify afterwards with `flask check-indexes`.
+USE lms;
+
+create index ix_courseclass_trainerId on courseclass (trainerId);
+create index ix_courseclass_courseId on courseclass (courseId);
+create index ix_lesson_courseClassId on lesson (courseClassId);
+create index ix_quiz_lessonId on quiz (lessonId);
+create unique index ux_user_name on user (name);
+create unique index ux_course_courseName on course (courseName);
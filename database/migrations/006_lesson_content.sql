@@ -0,0 +1,23 @@
+-- Moves lesson.lessonContent and lesson.links ('||' joined) into ordered child tables.
+-- 1. run this file
+-- 2. run `flask migrate-lesson-content` (online, can be re-run) to copy the existing values
+-- 3. once every instance runs the new code, lesson.lessonContent and lesson.links can be dropped
+USE lms;
+
+create table if not exists lessoncontent
+(
+    lessonId int NOT NULL,
+    position int NOT NULL,
+    content mediumtext NOT NULL,
+    PRIMARY KEY (lessonId, position),
+    FOREIGN KEY fk1 (lessonId) REFERENCES lesson(lessonId) ON DELETE CASCADE
+);
+
+create table if not exists lessonlink
+(
+    lessonId int NOT NULL,
+    position int NOT NULL,
+    link text NOT NULL,
+    PRIMARY KEY (lessonId, position),
+    FOREIGN KEY fk1 (lessonId) REFERENCES lesson(lessonId) ON DELETE CASCADE
+);
@@ -0,0 +1,16 @@
+-- Metadata of lesson attachments, the files themselves are stored under ATTACHMENT_DIR by sha256
+USE lms;
+
+create table if not exists lessonattachment
+(
+    attachmentId int NOT NULL AUTO_INCREMENT,
+    lessonId int NOT NULL,
+    fileName varchar(250) NOT NULL,
+    mimeType varchar(100) NOT NULL,
+    size bigint NOT NULL,
+    sha256 char(64) NOT NULL,
+    PRIMARY KEY (attachmentId),
+    KEY ix_lessonattachment_lessonId (lessonId),
+    KEY ix_lessonattachment_sha256 (sha256),
+    FOREIGN KEY fk1 (lessonId) REFERENCES lesson(lessonId) ON DELETE CASCADE
+);
@@ -0,0 +1,6 @@
+-- Lessons get an explicit order within their class for /lessons/bulk/reorder.
+-- Existing lessons keep position 0 and are listed by lessonId until reordered.
+USE lms;
+
+alter table lesson add column position int NOT NULL DEFAULT 0;
+alter table lesson drop index ix_lesson_courseClassId, add index ix_lesson_courseClassId (courseClassId, position);
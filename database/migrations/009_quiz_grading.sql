@@ -0,0 +1,9 @@
+-- Keys used by the in-house quiz grading engine.
+-- ux_quizoutcome_attempt lets a batch of outcomes inserted with executemany be read back,
+-- questionoutcome needs a primary key to be mapped.
+USE lms;
+
+create index ix_question_quizId on question (quizId);
+create unique index ux_quizoutcome_attempt on quizoutcome (quizId, userId, attemptedNumber);
+alter table questionoutcome modify quizOutcomeId int NOT NULL, modify questionId int NOT NULL,
+    add primary key (quizOutcomeId, questionId);
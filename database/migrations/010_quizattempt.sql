@@ -0,0 +1,19 @@
+-- Queue of submitted quiz attempts, graded in batches by the grading workers (`flask grade-worker`).
+-- status: 0 queued, 1 grading, 2 graded, 3 failed
+USE lms;
+
+create table if not exists quizattempt
+(
+    attemptId int NOT NULL AUTO_INCREMENT,
+    quizId int NOT NULL,
+    userId int NOT NULL,
+    courseClassId int NULL,
+    answers text NOT NULL,
+    status int NOT NULL DEFAULT 0,
+    claimToken varchar(32) NULL,
+    claimedAt datetime NULL,
+    quizOutcomeId int NULL,
+    submittedAt datetime NOT NULL,
+    PRIMARY KEY (attemptId),
+    INDEX ix_quizattempt_status (status, attemptId)
+);
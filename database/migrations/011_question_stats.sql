@@ -0,0 +1,24 @@
+-- Running sums behind /quiz/<quizId>/stats, kept up to date by the grading engine.
+-- Run `flask recompute-quiz-stats` afterwards to fill them from the existing questionoutcome rows.
+USE lms;
+
+create table if not exists questionstats
+(
+    questionId int NOT NULL,
+    quizId int NOT NULL,
+    attempts bigint NOT NULL DEFAULT 0,
+    correct bigint NOT NULL DEFAULT 0,
+    sumMarks bigint NOT NULL DEFAULT 0,
+    sumMarksSq bigint NOT NULL DEFAULT 0,
+    sumCorrectMarks bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (questionId),
+    INDEX ix_questionstats_quizId (quizId)
+);
+
+create table if not exists questionoptionstats
+(
+    questionId int NOT NULL,
+    selectedOption char(1) NOT NULL,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (questionId, selectedOption)
+);
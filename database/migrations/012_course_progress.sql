@@ -0,0 +1,19 @@
+-- Lesson completion is stored as a bitmap per learner and class, bit n is the lesson with ordinal n.
+-- learnerId becomes a varchar to match enrollment.learnerId.
+-- The old completedLessonIDs/incompleteLessonIDs strings were never written by the application.
+USE lms;
+
+alter table lesson add column ordinal int NOT NULL DEFAULT 0;
+update lesson l
+    join (select lessonId, row_number() over (partition by courseClassId order by position, lessonId) - 1 as n
+          from lesson) numbered on numbered.lessonId = l.lessonId
+    set l.ordinal = numbered.n;
+
+-- fk1 (learnerId -> user.userId) is the first foreign key of the table
+alter table courseprogress drop foreign key courseprogress_ibfk_1;
+alter table courseprogress
+    modify learnerId varchar(100) NOT NULL,
+    drop column completedLessonIDs,
+    drop column incompleteLessonIDs,
+    add column completedLessons blob NOT NULL,
+    add primary key (courseClassId, learnerId);
@@ -0,0 +1,13 @@
+-- Prerequisites as edges between courses, set through prerequisiteIds on /course/add and /course/update.
+-- course.prerequisites stays as the free-form description shown to learners.
+USE lms;
+
+create table if not exists courseprerequisite
+(
+    courseId int NOT NULL,
+    prerequisiteId int NOT NULL,
+    PRIMARY KEY (courseId, prerequisiteId),
+    INDEX ix_courseprerequisite_prerequisiteId (prerequisiteId),
+    FOREIGN KEY fk1 (courseId) REFERENCES course(courseId) ON DELETE CASCADE,
+    FOREIGN KEY fk2 (prerequisiteId) REFERENCES course(courseId) ON DELETE CASCADE
+);
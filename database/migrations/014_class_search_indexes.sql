@@ -0,0 +1,9 @@
+-- Composite indexes for /class/search, which orders by (startDateTime, courseClassId).
+-- The courseId and trainerId indexes gain startDateTime so a filtered search reads the range in order.
+-- Verify afterwards with `flask check-indexes`.
+USE lms;
+
+alter table courseclass
+    drop index ix_courseclass_trainerId, add index ix_courseclass_trainerId (trainerId, startDateTime),
+    drop index ix_courseclass_courseId, add index ix_courseclass_courseId (courseId, startDateTime),
+    add index ix_courseclass_startDateTime (startDateTime, courseClassId);
@@ -0,0 +1,5 @@
+-- Number of times a quiz attempt was requeued after a database error while grading,
+-- attempts are marked failed after GRADING_MAX_RETRIES requeues.
+USE lms;
+
+alter table quizattempt add column retries int NOT NULL DEFAULT 0;
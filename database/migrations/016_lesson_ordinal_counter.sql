@@ -0,0 +1,12 @@
+-- Lesson ordinals are handed out from a per-class counter so the ordinal (and CourseProgress bit)
+-- of a deleted lesson is never given to a new lesson.
+-- The counter starts after the highest lesson ordinal and after every bit already stored in a
+-- progress bitmap, so bits of lessons deleted before this migration are not reused either.
+USE lms;
+
+alter table courseclass add column nextLessonOrdinal int NOT NULL DEFAULT 0;
+update courseclass c
+    set c.nextLessonOrdinal = greatest(
+        coalesce((select max(l.ordinal) + 1 from lesson l where l.courseClassId = c.courseClassId), 0),
+        coalesce((select max(length(p.completedLessons)) * 8 from courseprogress p
+                  where p.courseClassId = c.courseClassId), 0));
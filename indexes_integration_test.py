@@ -0,0 +1,32 @@
+"""
+Checks that the handler queries are served by indexes
+"""
+import unittest
+import flask_testing
+from lms import app, db, check_indexes
+
+class TestApp(flask_testing.TestCase):
+    app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite://"
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {}
+    app.config['TESTING'] = True
+    maxDiff = None
+
+    def create_app(self):
+        return app
+
+    def setUp(self):
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+
+class TestIndexes(TestApp):
+    #test every handler query uses an index instead of scanning its table
+    def test_handler_queries_use_indexes(self):
+        scans = [(name, plan) for name, uses_index, plan in check_indexes() if not uses_index]
+        self.assertEqual(scans, [])
+
+if __name__ == '__main__':
+    unittest.main()
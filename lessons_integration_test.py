@@ -4,8 +4,12 @@ Owner of TDD: Weijie
 import unittest
 import flask_testing
 import json
+import os
+import shutil
+import tempfile
 from datetime import datetime
-from lms import app, db, Lesson, CourseClass
+from werkzeug.wsgi import FileWrapper
+from lms import app, db, Lesson, LessonContent, CourseClass, Quiz, migrate_lesson_content, attachment_path, FileRange
 
 class TestApp(flask_testing.TestCase):
     app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite://"
@@ -36,6 +40,35 @@ class TestLessons(TestApp):
 
         response = self.client.get("/lessons/1")
 
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            'data':{
+                "lessons":[
+                    {
+                        "lessonId": 1,
+                        "courseClassId": 1, 
+                        "lessonName": 'abc'
+                    },
+                    {
+                        "lessonId": 2,
+                        "courseClassId": 1, 
+                        "lessonName": 'bac'
+                    }
+                ]
+            }
+        })
+
+    #test search lessons by courseClassId with their content
+    def test_search_lessons_with_content(self):
+        l1 = Lesson(courseClassId = 1, lessonName = 'abc',
+                    lessonContent = "abc||123||lol", links = "www.google.com||www.googledrive.com")
+        l2 = Lesson(courseClassId = 1, lessonName = 'bac')
+        db.session.add(l1)
+        db.session.add(l2)
+        db.session.commit()
+
+        response = self.client.get("/lessons/1?content=1")
+
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json, {
             'data':{
@@ -58,6 +91,26 @@ class TestLessons(TestApp):
             }
         })
 
+    #test loading the content of one lesson
+    def test_find_lesson_content(self):
+        l1 = Lesson(courseClassId = 1, lessonName = 'abc',
+                    lessonContent = ["abc", "123", "lol"], links = ["www.google.com"])
+        db.session.add(l1)
+        db.session.commit()
+
+        response = self.client.get("/lesson/1/content")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            'data': {
+                "lessonId": 1,
+                "courseClassId": 1, 
+                "lessonName": 'abc', 
+                "lessonContent": ["abc", "123", "lol"], 
+                "links": ["www.google.com"]
+            }
+        })
+        self.assertEqual(self.client.get("/lesson/2/content").status_code, 404)
+
     #test search invalid courseclassId
     def test_search_lesson_by_invalid_courseClassId(self):
         l1 = Lesson(courseClassId = 1, lessonName = 'abc',
@@ -158,5 +211,267 @@ class TestLessons(TestApp):
             "message": "Lesson was not found."
         })
 
+    #test deleting a lesson changes the ETag of the lesson list
+    def test_lessons_etag_changes_on_delete(self):
+        l1 = Lesson(courseClassId = 1, lessonName = 'abc',
+                    lessonContent = "abc||123||lol", links = "www.google.com||www.googledrive.com")
+        l2 = Lesson(courseClassId = 1, lessonName = 'bac')
+        db.session.add(l1)
+        db.session.add(l2)
+        db.session.commit()
+
+        etag = self.client.get("/lessons/1").headers['ETag']
+        self.assertEqual(self.client.get("/lessons/1", headers={'If-None-Match': etag}).status_code, 304)
+        self.client.post("/lesson/delete/1")
+        response = self.client.get("/lessons/1", headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json['data']['lessons']), 1)
+
+    #test migrating the legacy '||' joined lesson columns into their own tables
+    def test_migrate_lesson_content(self):
+        db.session.execute(db.text("ALTER TABLE lesson ADD COLUMN lessonContent varchar(999)"))
+        db.session.execute(db.text("ALTER TABLE lesson ADD COLUMN links varchar(999)"))
+        db.session.execute(db.text("INSERT INTO lesson (lessonId, courseClassId, lessonName, lessonContent, links) "
+                                   "VALUES (1, 1, 'abc', 'abc||123', 'www.google.com'), (2, 1, 'bac', NULL, NULL)"))
+        db.session.commit()
+
+        self.assertEqual(migrate_lesson_content(batch_size=1), 3)
+        self.assertEqual(migrate_lesson_content(batch_size=1), 0)
+
+        response = self.client.get("/lesson/1/content")
+        self.assertEqual(response.json['data']['lessonContent'], ["abc", "123"])
+        self.assertEqual(response.json['data']['links'], ["www.google.com"])
+
+
+class TestBulkLessons(TestApp):
+    def setUp(self):
+        super().setUp()
+        db.session.add(CourseClass(courseId = 1, startDateTime = datetime(2021, 10, 8),
+                            endDateTime = datetime(2021, 10, 9), learnerIds = "{}",
+                            trainerId = 1, classSize = 10))
+        db.session.commit()
+
+    def post(self, url, body):
+        return self.client.post(url, data=json.dumps(body), content_type='application/json')
+
+    #test creating many lessons reports the invalid ones and keeps the valid ones in order
+    def test_create_lessons_bulk(self):
+        response = self.post("/lessons/bulk", {
+            "courseClassId": 1,
+            "lessons": [
+                {"lessonName": 'abc', "lessonContent": ["abc", "123"], "links": "www.google.com"},
+                {"lessonContent": "no name"},
+                {"lessonName": 'bac'}
+            ]
+        })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json, {
+            "data": {
+                "created": [{"index": 0, "lessonId": 1}, {"index": 2, "lessonId": 2}],
+                "failed": [{"index": 1, "message": "lessonName is required."}]
+            }
+        })
+        response = self.client.get("/lessons/1?content=1")
+        self.assertEqual(response.json['data']['lessons'], [
+            {"lessonId": 1, "courseClassId": 1, "lessonName": 'abc',
+             "lessonContent": ["abc", "123"], "links": ["www.google.com"]},
+            {"lessonId": 2, "courseClassId": 1, "lessonName": 'bac',
+             "lessonContent": None, "links": None}
+        ])
+
+    #test creating lessons for a class that does not exist
+    def test_create_lessons_bulk_no_class(self):
+        response = self.post("/lessons/bulk", {"courseClassId": 2, "lessons": [{"lessonName": 'abc'}]})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json, {"message": "This class does not exist."})
+
+    #test lessons added one by one go after the bulk created ones
+    def test_add_lesson_after_bulk(self):
+        self.post("/lessons/bulk", {"courseClassId": 1, "lessons": [{"lessonName": 'abc'}, {"lessonName": 'bac'}]})
+        self.post("/lessons/bulk/reorder", {"courseClassId": 1, "lessonIds": [2, 1]})
+        self.post("/lesson/add", {"courseClassId": 1, "lessonName": 'cab', "lessonContent": None, "links": None})
+
+        response = self.client.get("/lessons/1")
+        self.assertEqual([lesson['lessonId'] for lesson in response.json['data']['lessons']], [2, 1, 3])
+
+    #test reordering lessons, unknown ids are reported and unlisted lessons keep their order
+    def test_reorder_lessons_bulk(self):
+        self.post("/lessons/bulk", {"courseClassId": 1,
+                                    "lessons": [{"lessonName": 'a'}, {"lessonName": 'b'}, {"lessonName": 'c'}]})
+        etag = self.client.get("/lessons/1").headers['ETag']
+
+        response = self.post("/lessons/bulk/reorder", {"courseClassId": 1, "lessonIds": [3, 9, 1]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            "data": {
+                "lessonIds": [3, 1, 2],
+                "failed": [{"lessonId": 9, "message": "Lesson was not found in this class."}]
+            }
+        })
+        response = self.client.get("/lessons/1", headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([lesson['lessonName'] for lesson in response.json['data']['lessons']], ['c', 'a', 'b'])
+
+    #test deleting lessons in bulk removes their content and reports missing ids
+    def test_delete_lessons_bulk(self):
+        self.post("/lessons/bulk", {"courseClassId": 1,
+                                    "lessons": [{"lessonName": 'a', "lessonContent": "x||y"}, {"lessonName": 'b'}]})
+
+        response = self.post("/lessons/bulk/delete", {"lessonIds": [1, 5]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            "data": {
+                "deleted": [1],
+                "failed": [{"lessonId": 5, "message": "Lesson was not found."}]
+            }
+        })
+        self.assertEqual(LessonContent.query.count(), 0)
+        self.assertEqual([lesson['lessonId'] for lesson in self.client.get("/lessons/1").json['data']['lessons']], [2])
+
+    #test lessons that still have quizzes are reported and the others are deleted
+    def test_delete_lessons_bulk_with_quiz(self):
+        self.post("/lessons/bulk", {"courseClassId": 1, "lessons": [{"lessonName": 'a'}, {"lessonName": 'b'}]})
+        db.session.add(Quiz(lessonId = 1, isGraded = 1, passingMark = 1, numOfQns = 1, quizLink = '', isActive = '1'))
+        db.session.commit()
+
+        response = self.post("/lessons/bulk/delete", {"lessonIds": [1, 2]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            "data": {
+                "deleted": [2],
+                "failed": [{"lessonId": 1, "message": "Lesson still has quizzes."}]
+            }
+        })
+        self.assertEqual(self.post("/lessons/bulk/delete", {"lessonIds": [1]}).status_code, 409)
+        self.assertEqual(self.client.post("/lesson/delete/1").status_code, 409)
+
+class TestLessonAttachments(TestApp):
+    def setUp(self):
+        super().setUp()
+        self.attachment_dir = tempfile.mkdtemp()
+        app.config['ATTACHMENT_DIR'] = self.attachment_dir
+        db.session.add(Lesson(courseClassId = 1, lessonName = 'abc'))
+        db.session.commit()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.attachment_dir)
+
+    def upload(self, data, fileName = 'notes.txt'):
+        return self.client.post("/lesson/1/attachments?fileName=" + fileName, data = data,
+                                content_type = 'text/plain')
+
+    #test uploading and listing attachments of a lesson
+    def test_upload_attachment(self):
+        response = self.upload(b"0123456789")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['data']['size'], 10)
+        self.assertEqual(response.json['data']['mimeType'], 'text/plain')
+
+        response = self.client.get("/lesson/1/attachments")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a['fileName'] for a in response.json['data']], ['notes.txt'])
+
+    #test uploading to a lesson that does not exist
+    def test_upload_attachment_no_lesson(self):
+        response = self.client.post("/lesson/2/attachments?fileName=notes.txt", data = b"abc")
+        self.assertEqual(response.status_code, 404)
+
+    #test uploading a file above the size limit
+    def test_upload_attachment_too_large(self):
+        app.config['ATTACHMENT_MAX_SIZE'] = 5
+        try:
+            response = self.upload(b"0123456789")
+        finally:
+            app.config['ATTACHMENT_MAX_SIZE'] = 2 * 1024 ** 3
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.client.get("/lesson/1/attachments").status_code, 404)
+
+    #test downloading a byte range and revalidating with the ETag
+    def test_download_attachment_range(self):
+        attachmentId = self.upload(b"0123456789").json['data']['attachmentId']
+
+        response = self.client.get("/attachment/%d" % attachmentId)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"0123456789")
+        etag = response.headers['ETag']
+        response.close()
+
+        response = self.client.get("/attachment/%d" % attachmentId, headers = {'Range': 'bytes=2-5'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, b"2345")
+        self.assertEqual(response.headers['Content-Range'], 'bytes 2-5/10')
+        response.close()
+
+        response = self.client.get("/attachment/%d" % attachmentId, headers = {'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        response.close()
+
+    #test a range is handed to the server's file wrapper as a file it can sendfile from the range start
+    def test_download_attachment_range_file_wrapper(self):
+        attachmentId = self.upload(b"0123456789").json['data']['attachmentId']
+        wrapped = []
+        def file_wrapper(file, buffer_size=8192):
+            wrapped.append(file)
+            return FileWrapper(file, buffer_size)
+
+        response = self.client.get("/attachment/%d" % attachmentId, headers = {'Range': 'bytes=2-5'},
+                                   environ_base = {'wsgi.file_wrapper': file_wrapper})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, b"2345")
+        self.assertEqual(response.headers['Content-Length'], '4')
+        self.assertIsInstance(wrapped[-1], FileRange)
+        response.close()
+
+    #test with USE_X_SENDFILE the proxy gets the whole file and answers the Range itself
+    def test_download_attachment_range_x_sendfile(self):
+        attachmentId = self.upload(b"0123456789").json['data']['attachmentId']
+        app.use_x_sendfile = True
+        try:
+            response = self.client.get("/attachment/%d" % attachmentId, headers = {'Range': 'bytes=2-5'})
+        finally:
+            app.use_x_sendfile = False
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers['Content-Length'], '10')
+        self.assertNotIn('Content-Range', response.headers)
+        self.assertTrue(response.headers['X-Sendfile'].endswith(attachment_path(response.headers['ETag'].strip('"'))))
+        response.close()
+
+    #test deleting attachments removes the file once it is no longer shared
+    def test_delete_attachment(self):
+        first = self.upload(b"same bytes").json['data']
+        second = self.upload(b"same bytes", 'copy.txt').json['data']
+        self.assertEqual(first['sha256'], second['sha256'])
+
+        self.assertEqual(self.client.post("/attachment/delete/%d" % first['attachmentId']).status_code, 200)
+        response = self.client.get("/attachment/%d" % second['attachmentId'])
+        self.assertEqual(response.data, b"same bytes")
+        response.close()
+
+        self.client.post("/attachment/delete/%d" % second['attachmentId'])
+        self.assertEqual(self.client.get("/attachment/%d" % second['attachmentId']).status_code, 404)
+
+    #test deleting lessons removes their attachment files unless another lesson shares them
+    def test_delete_lesson_removes_attachments(self):
+        db.session.add(Lesson(courseClassId = 1, lessonName = 'bac'))
+        db.session.commit()
+        shared = self.upload(b"shared").json['data']['sha256']
+        own = self.upload(b"own").json['data']['sha256']
+        self.client.post("/lesson/2/attachments?fileName=copy.txt", data = b"shared", content_type = 'text/plain')
+
+        self.assertEqual(self.client.post("/lesson/delete/1").status_code, 200)
+        self.assertFalse(os.path.exists(attachment_path(own)))
+        self.assertTrue(os.path.exists(attachment_path(shared)))
+
+        response = self.client.post("/lessons/bulk/delete", data = json.dumps({"lessonIds": [2]}),
+                                    content_type = 'application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(os.path.exists(attachment_path(shared)))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+import unittest
+import flask_testing
+import json
+from datetime import datetime
+from lms import app, db, CourseClass, CourseProgress
+
+class TestApp(flask_testing.TestCase):
+    app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite://"
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {}
+    app.config['TESTING'] = True
+    maxDiff = None
+
+    def create_app(self):
+        return app
+
+    def setUp(self):
+        db.create_all()
+        db.session.add(CourseClass(courseId = 3, startDateTime = datetime(2021, 10, 8),
+                            endDateTime = datetime(2021, 10, 9), learnerIds = "{'1': 1, '2': 1, '3': 0}",
+                            trainerId = 1, classSize = 10))
+        db.session.commit()
+        self.post("/lessons/bulk", {"courseClassId": 1,
+                                    "lessons": [{"lessonName": 'a'}, {"lessonName": 'b'},
+                                                {"lessonName": 'c'}, {"lessonName": 'd'}]})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+
+    def post(self, url, body):
+        return self.client.post(url, data=json.dumps(body), content_type='application/json')
+
+
+class TestProgress(TestApp):
+    #test marking lessons complete and the class summary
+    def test_class_progress(self):
+        self.post("/progress/complete", {"learnerId": 1, "lessonId": 1})
+        self.post("/progress/complete", {"learnerId": 1, "lessonId": 3})
+        self.post("/progress/complete", {"learnerId": 1, "lessonId": 3})
+        response = self.post("/progress/complete", {"learnerId": 2, "lessonId": 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data']['courseId'], 3)
+        self.assertEqual(response.json['data']['currentLessonId'], 4)
+
+        response = self.client.get("/progress/class/1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            "data": {
+                "courseClassId": 1,
+                "lessons": 4,
+                "averagePercentComplete": 37.5,
+                "learners": [
+                    {"learnerId": 1, "completedLessons": 2, "percentComplete": 50.0},
+                    {"learnerId": 2, "completedLessons": 1, "percentComplete": 25.0}
+                ]
+            }
+        })
+
+    #test a deleted lesson no longer counts and reordering keeps the completed lessons
+    def test_progress_after_lesson_changes(self):
+        self.post("/progress/complete", {"learnerId": 1, "lessonId": 1})
+        self.post("/progress/complete", {"learnerId": 1, "lessonId": 2})
+        self.post("/lessons/bulk/delete", {"lessonIds": [2]})
+        self.post("/lessons/bulk/reorder", {"courseClassId": 1, "lessonIds": [4, 3, 1]})
+        self.post("/lessons/bulk", {"courseClassId": 1, "lessons": [{"lessonName": 'e'}]})
+
+        response = self.client.get("/progress/class/1/learner/1")
+
+        self.assertEqual(response.json['data']['completedLessonIds'], [1])
+        self.assertEqual(response.json['data']['incompleteLessonIds'], [4, 3, 5])
+        self.assertEqual(self.client.get("/progress/class/1").json['data']['learners'][0]['percentComplete'], 25.0)
+
+    #test a lesson added after the highest lesson was deleted does not inherit its completion
+    def test_deleted_lesson_ordinal_not_reused(self):
+        self.post("/progress/complete", {"learnerId": 1, "lessonId": 4})
+        self.post("/lesson/delete/4", {})
+        lessonId = self.post("/lesson/add", {"courseClassId": 1, "lessonName": 'e',
+                                             "lessonContent": None, "links": None}).json['data']['lessonId']
+
+        response = self.client.get("/progress/class/1/learner/1")
+
+        self.assertEqual(response.json['data']['completedLessonIds'], [])
+        self.assertEqual(response.json['data']['incompleteLessonIds'], [1, 2, 3, lessonId])
+        self.assertEqual(CourseClass.query.get(1).nextLessonOrdinal, 5)
+
+    #test a pending learner cannot complete lessons
+    def test_complete_lesson_not_enrolled(self):
+        response = self.post("/progress/complete", {"learnerId": 3, "lessonId": 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"message": "Learner is not enrolled in this class."})
+        self.assertEqual(CourseProgress.query.count(), 0)
+
+    #test progress of a class without learners
+    def test_class_progress_no_learners(self):
+        response = self.client.get("/progress/class/2")
+        self.assertEqual(response.status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
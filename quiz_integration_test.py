@@ -4,7 +4,13 @@ Owner of TDD:  Glenda
 import unittest
 import flask_testing
 import json
-from lms import app, db, Quiz, Lesson
+import numpy as np
+from datetime import datetime
+from unittest import mock
+from sqlalchemy.exc import OperationalError
+from lms import app, db, Quiz, Lesson, Question, QuizOutcome, QuestionOutcome, CourseClass, \
+    QuizAttempt, grade_queued_attempts, QuestionStats, recompute_quiz_stats, TableVersion, \
+    claim_attempts, grade_claimed_attempts
 
 class TestApp(flask_testing.TestCase):
     app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite://"
@@ -162,6 +168,203 @@ class TestQuizzes(TestApp):
             }
         })
 
+class QuestionBankApp(TestApp):
+    def setUp(self):
+        super().setUp()
+        db.session.add(Quiz(quizId = 1, lessonId = 1, isGraded = 1, passingMark = 2, numOfQns = 3, isActive = 'True'))
+        db.session.add_all([Question(quizId = 1, answer = 'A'), Question(quizId = 1, answer = 'C'),
+                            Question(quizId = 1, answer = 'B')])
+        db.session.add(CourseClass(courseId = 4, startDateTime = datetime(2021, 10, 8),
+                            endDateTime = datetime(2021, 10, 9), learnerIds = "{}",
+                            trainerId = 1, classSize = 10))
+        db.session.commit()
+
+class TestQuizGrading(QuestionBankApp):
+    def grade(self, attempts):
+        return self.client.post("/quiz/1/grade",
+                                data=json.dumps({"attempts": attempts}),
+                                content_type='application/json')
+
+    #test grading a batch of attempts against the answer key and passingMark
+    def test_grade_attempts(self):
+        response = self.grade([
+            {"userId": 1, "courseClassId": 1, "answers": {"1": "A", "2": "C", "3": "D"}},
+            {"userId": 2, "courseClassId": 1, "answers": {"1": "B", "3": "B"}},
+            {"userId": 1, "courseClassId": 1, "answers": {"1": "A", "2": "C", "3": "B"}}
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([(o['userId'], o['marks'], o['passed'], o['attemptedNumber'], o['courseId'])
+                          for o in response.json['data']],
+                         [(1, 2, True, 1, 4), (2, 1, False, 1, 4), (1, 3, True, 2, 4)])
+        self.assertEqual(QuizOutcome.query.count(), 3)
+        second = response.json['data'][1]['quizOutcomeId']
+        self.assertEqual([(o.questionId, o.selectedOption, o.isCorrect) for o in
+                          QuestionOutcome.query.filter_by(quizOutcomeId = second).order_by(QuestionOutcome.questionId)],
+                         [(1, 'B', False), (2, None, False), (3, 'B', True)])
+
+    #test later batches continue the attempt numbers
+    def test_grade_attempts_numbering(self):
+        self.grade([{"userId": 1, "answers": {}}])
+        response = self.grade([{"userId": 1, "answers": {"2": "C"}}])
+        self.assertEqual(response.json['data'][0]['attemptedNumber'], 2)
+        self.assertEqual(response.json['data'][0]['marks'], 1)
+
+    #test an invalid attempt rejects the batch
+    def test_grade_invalid_attempt(self):
+        response = self.grade([{"userId": 1, "answers": {"1": "AB"}}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"message": "Attempt 0: option of question 1 must be a single character."})
+        self.assertEqual(QuizOutcome.query.count(), 0)
+
+    #test grading a quiz that does not exist
+    def test_grade_no_quiz(self):
+        response = self.client.post("/quiz/2/grade", data=json.dumps({"attempts": []}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+
+class TestQuizStats(QuestionBankApp):
+    attempts = [
+        {"userId": 1, "answers": {"1": "A", "2": "C", "3": "B"}},
+        {"userId": 2, "answers": {"1": "A", "2": "B"}},
+        {"userId": 3, "answers": {"1": "B", "2": "C", "3": "A"}},
+        {"userId": 4, "answers": {"1": "C", "3": "A"}}
+    ]
+
+    def grade(self, attempts):
+        return self.client.post("/quiz/1/grade",
+                                data=json.dumps({"attempts": attempts}),
+                                content_type='application/json')
+
+    #test stats are accumulated across batches and match a full computation
+    def test_quiz_stats(self):
+        self.grade(self.attempts[:1])
+        self.grade(self.attempts[1:])
+
+        response = self.client.get("/quiz/1/stats")
+
+        self.assertEqual(response.status_code, 200)
+        first = response.json['data']['questions'][0]
+        self.assertEqual(first['attempts'], 4)
+        self.assertEqual(first['percentCorrect'], 50.0)
+        self.assertEqual(first['options'], {"A": 2, "B": 1, "C": 1})
+        self.assertEqual(first['unanswered'], 0)
+        self.assertEqual(response.json['data']['questions'][2]['unanswered'], 1)
+        correct = np.array([1, 1, 0, 0])
+        marks = np.array([3, 1, 1, 0])
+        self.assertAlmostEqual(first['pointBiserial'], np.corrcoef(correct, marks)[0, 1])
+
+    #test recomputing from questionoutcome gives the same stats
+    def test_recompute_quiz_stats(self):
+        self.grade(self.attempts)
+        before = self.client.get("/quiz/1/stats").json
+
+        self.assertEqual(recompute_quiz_stats(1), 3)
+
+        self.assertEqual(self.client.get("/quiz/1/stats").json, before)
+        self.assertEqual(QuestionStats.query.count(), 3)
+
+    #test stats of a quiz without graded attempts
+    def test_quiz_stats_empty(self):
+        response = self.client.get("/quiz/1/stats")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json, {"message": "Quiz has no graded attempts."})
+
+
+class TestQuizSubmission(QuestionBankApp):
+    def submit(self, body, quizId = 1):
+        return self.client.post("/quiz/%d/submit" % quizId,
+                                data=json.dumps(body),
+                                content_type='application/json')
+
+    #test a submitted attempt is queued and graded by the worker in a batch
+    def test_submit_and_poll(self):
+        first = self.submit({"userId": 1, "courseClassId": 1, "answers": {"1": "A", "2": "C"}})
+        second = self.submit({"userId": 2, "answers": {"1": "B"}})
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(first.json['data']['status'], "queued")
+
+        response = self.client.get("/quiz/attempt/%d" % first.json['data']['attemptId'])
+        self.assertEqual(response.json['data']['status'], "queued")
+
+        self.assertEqual(grade_queued_attempts(batch_size = 10), 2)
+        self.assertEqual(grade_queued_attempts(batch_size = 10), 0)
+
+        response = self.client.get("/quiz/attempt/%d" % first.json['data']['attemptId'])
+        self.assertEqual(response.json['data']['status'], "graded")
+        self.assertEqual(response.json['data']['outcome']['marks'], 2)
+        self.assertEqual(response.json['data']['outcome']['passed'], True)
+        response = self.client.get("/quiz/attempt/%d" % second.json['data']['attemptId'])
+        self.assertEqual(response.json['data']['outcome']['passed'], False)
+
+    #test attempts of a quiz that was deleted are marked as failed
+    def test_submit_deleted_quiz(self):
+        attemptId = self.submit({"userId": 1, "answers": {}}).json['data']['attemptId']
+        self.client.post("/quiz/delete/1")
+
+        grade_queued_attempts()
+
+        response = self.client.get("/quiz/attempt/%d" % attemptId)
+        self.assertEqual(response.json['data']['status'], "failed")
+
+    #test submissions and grading only write tables that are not behind an ETag
+    def test_submit_does_not_bump_table_versions(self):
+        versions = dict(db.session.query(TableVersion.tableName, TableVersion.version))
+        self.submit({"userId": 1, "answers": {"1": "A"}})
+        grade_queued_attempts()
+        self.assertEqual(dict(db.session.query(TableVersion.tableName, TableVersion.version)), versions)
+        self.assertNotIn('quizattempt', versions)
+
+    #test attempts of a user whose earlier attempt is being graded by another worker stay queued
+    def test_claim_skips_user_being_graded(self):
+        self.submit({"userId": 1, "answers": {"1": "A"}})
+        QuizAttempt.query.update({"status": 1, "claimToken": "OTHER", "claimedAt": datetime.utcnow()})
+        db.session.commit()
+        second = self.submit({"userId": 1, "answers": {"1": "B"}}).json['data']['attemptId']
+        third = self.submit({"userId": 2, "answers": {"1": "B"}}).json['data']['attemptId']
+
+        attempts, token = claim_attempts(10)
+        self.assertEqual([attempt.attemptId for attempt in attempts], [third])
+        self.assertEqual(db.session.get(QuizAttempt, second).status, 0)
+
+    #test a worker whose claim was handed to another worker does not store its grades
+    def test_lost_claim_drops_grades(self):
+        attemptId = self.submit({"userId": 1, "answers": {"1": "A"}}).json['data']['attemptId']
+        attempts, token = claim_attempts(10)
+        QuizAttempt.query.update({"claimToken": "OTHER"})
+        db.session.commit()
+
+        grade_claimed_attempts(1, attempts, token)
+
+        self.assertEqual(QuizOutcome.query.count(), 0)
+        self.assertEqual(QuestionStats.query.count(), 0)
+        attempt = db.session.get(QuizAttempt, attemptId)
+        self.assertEqual((attempt.status, attempt.claimToken), (1, "OTHER"))
+
+    #test attempts that hit a database error are requeued and only fail after the retries run out
+    def test_database_error_requeues(self):
+        attemptId = self.submit({"userId": 1, "answers": {"1": "A"}}).json['data']['attemptId']
+        error = OperationalError("INSERT", {}, Exception("Deadlock found when trying to get lock"))
+        with mock.patch('lms.grade_attempts', side_effect=error):
+            grade_queued_attempts()
+            attempt = db.session.get(QuizAttempt, attemptId)
+            self.assertEqual((attempt.status, attempt.retries, attempt.claimToken), (0, 1, None))
+            for retry in range(app.config['GRADING_MAX_RETRIES'] - 1):
+                grade_queued_attempts()
+        self.assertEqual(self.client.get("/quiz/attempt/%d" % attemptId).json['data']['status'], "failed")
+
+    #test an invalid submission is rejected before it is queued
+    def test_submit_invalid(self):
+        response = self.submit({"answers": {}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(QuizAttempt.query.count(), 0)
+
+    #test polling an attempt that does not exist
+    def test_poll_no_attempt(self):
+        response = self.client.get("/quiz/attempt/1")
+        self.assertEqual(response.status_code, 404)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Measures cold start of the backend: importing lms (which builds the app with create_app)
+and serving the first request, each in a fresh interpreter.
+Usage: DATABASE_URL=sqlite:// python startup_benchmark.py [runs]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import lms
+imported = time.perf_counter()
+lms.app.test_client().get("/")
+served = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_request": served - imported}))
+"""
+
+def measure(runs):
+    samples = []
+    for i in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE], check=True, stdout=subprocess.PIPE).stdout
+        samples.append(json.loads(output.decode().strip().splitlines()[-1]))
+    return samples
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    samples = measure(runs)
+    for name in ("import", "first_request"):
+        values = [sample[name] * 1000 for sample in samples]
+        print("%-14s median %7.1f ms   min %7.1f ms   max %7.1f ms" %
+              (name, statistics.median(values), min(values), max(values)))
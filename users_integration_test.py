@@ -5,8 +5,9 @@ Owner of TDD: Jeremy
 import unittest
 import flask_testing
 import json
+from unittest import mock
 from datetime import datetime
-from lms import app, db, User
+from lms import app, db, User, UserNameGram, load, load_many, get_loader, rebuild_user_name_index
 
 class TestApp(flask_testing.TestCase):
     app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite://"
@@ -295,5 +296,127 @@ class TestUsers(TestApp):
             "message": "Engineer not found."
         })
 
+    #test the request loader only queries each user once
+    def test_loader_memoizes_users(self):
+        test_user1 = User(name = 'testuser1', subrole = 'testsubrole1',
+                    department = "testdepartment1", email = "testuser1@email.com")
+        test_user2 = User(name = 'testuser2', subrole = 'testsubrole2',
+                    department = "testdepartment2", email = "testuser2@email.com")
+        db.session.add(test_user1)
+        db.session.add(test_user2)
+        db.session.commit()
+
+        with app.test_request_context():
+            users = load_many(User, [2, '1', 3])
+            self.assertEqual([user.name if user else None for user in users], ['testuser2', 'testuser1', None])
+            self.assertEqual(load(User, 1).name, 'testuser1')
+            self.assertIsNone(load(User, 3))
+            self.assertEqual(get_loader().queries, 1)
+            self.assertEqual(get_loader().get_saved(), 4)
+
+    #test updating a user looks the user up once
+    def test_update_user_queries(self):
+        test_user1 = User(name = 'testuser1', subrole = 'testsubrole1',
+                    department = "testdepartment1", email = "testuser1@email.com")
+        db.session.add(test_user1)
+        db.session.commit()
+
+        request_body = {
+            "userId": 1,
+            "name": 'updated_testuser1',
+            "subrole": 'updated_testsubrole',
+            "department": "updated_testdepartment",
+            "email": "updated_testuser1@email.com"
+        }
+
+        response = self.client.patch("/user",
+                                    data=json.dumps(request_body),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.headers['X-Loader-Queries'], '1')
+
+    #test paging through users with a cursor
+    def test_get_users_paginated(self):
+        for i in range(1, 6):
+            db.session.add(User(name = 'testuser' + str(i), subrole = 'testsubrole1',
+                    department = "Engineer" if i % 2 else "HR", email = "testuser1@email.com"))
+        db.session.commit()
+
+        response = self.client.get('/user?limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([user['userId'] for user in response.json['data']['users']], [1, 2])
+        self.assertEqual(response.json['data']['next_cursor'], 2)
+
+        response = self.client.get('/user?limit=2&after=4')
+        self.assertEqual([user['userId'] for user in response.json['data']['users']], [5])
+        self.assertEqual(response.json['data']['next_cursor'], None)
+
+        response = self.client.get('/user?limit=2&after=1&department=Engineer')
+        self.assertEqual([user['userId'] for user in response.json['data']['users']], [3, 5])
+        self.assertEqual(response.json['data']['next_cursor'], None)
+
+    #test searching user names ranks prefix matches first
+    def test_search_users(self):
+        for name, department in (('Amy Tan', 'Engineer'), ('Tanya Lim', 'Engineer'),
+                                 ('Stan Lee', 'HR'), ('Bob Ng', 'Engineer')):
+            db.session.add(User(name = name, subrole = 'testsubrole1',
+                    department = department, email = "testuser1@email.com"))
+        db.session.commit()
+
+        response = self.client.get("/user/search?q=tan")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([user['name'] for user in response.json['data']], ['Tanya Lim', 'Stan Lee', 'Amy Tan'])
+
+        response = self.client.get("/user/search?q=TAN&department=Engineer&limit=1")
+        self.assertEqual([user['name'] for user in response.json['data']], ['Tanya Lim'])
+
+        response = self.client.get("/user/search?q=g")
+        self.assertEqual([user['name'] for user in response.json['data']], ['Bob Ng'])
+
+        response = self.client.get("/user/search?q=tanx")
+        self.assertEqual(response.status_code, 404)
+
+    #test a limited one letter search only verifies a capped number of substring candidates
+    def test_search_users_short_query_limit(self):
+        for i in range(30):
+            db.session.add(User(name = 'Ben %02d' % i, subrole = 'testsubrole1',
+                    department = "Engineer", email = "testuser1@email.com"))
+        for name in ('Nora', 'Nadia'):
+            db.session.add(User(name = name, subrole = 'testsubrole1',
+                    department = "Engineer", email = "testuser1@email.com"))
+        db.session.commit()
+
+        response = self.client.get("/user/search?q=n&limit=1")
+        self.assertEqual([user['name'] for user in response.json['data']], ['Nadia'])
+
+        with mock.patch('lms.SEARCH_CANDIDATE_LIMIT', 5):
+            response = self.client.get("/user/search?q=n&limit=4")
+        self.assertEqual([user['name'] for user in response.json['data']], ['Nadia', 'Nora', 'Ben 00', 'Ben 01'])
+
+    #test the name index follows updates and deletes
+    def test_search_users_after_update_and_delete(self):
+        db.session.add(User(name = 'testuser1', subrole = 'testsubrole1',
+                    department = "Engineer", email = "testuser1@email.com"))
+        db.session.add(User(name = 'testuser2', subrole = 'testsubrole1',
+                    department = "Engineer", email = "testuser2@email.com"))
+        db.session.commit()
+
+        request_body = {
+            "userId": 1,
+            "name": 'renamed',
+            "subrole": 'testsubrole1',
+            "department": "Engineer",
+            "email": "testuser1@email.com"
+        }
+        self.client.patch("/user", data=json.dumps(request_body), content_type='application/json')
+        self.client.delete("/user/2")
+
+        self.assertEqual(self.client.get("/user/search?q=testuser").status_code, 404)
+        self.assertEqual(self.client.get("/user/engineer/name/nam").json['data'][0]['name'], 'renamed')
+        self.assertEqual(UserNameGram.query.filter_by(userId=2).count(), 0)
+
+        self.assertEqual(rebuild_user_name_index(), 1)
+        self.assertEqual(self.client.get("/user/search?q=renamed").status_code, 200)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file